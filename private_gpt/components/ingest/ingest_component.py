@@ -1,4 +1,5 @@
 import abc
+import functools
 import itertools
 import logging
 import multiprocessing
@@ -32,12 +33,23 @@ class BaseIngestComponent(abc.ABC):
         embed_model: EmbedType,
         transformations: list[TransformComponent],
         *args: Any,
+        chunking_workers: int = 1,
         **kwargs: Any,
     ) -> None:
         logger.debug("Initializing base ingest component type=%s", type(self).__name__)
         self.storage_context = storage_context
         self.embed_model = embed_model
         self.transformations = transformations
+        # Picklable, so it can be sent to the file parsing work pools
+        self._transform_file_into_documents = functools.partial(
+            IngestionHelper.transform_file_into_documents,
+            chunking_workers=chunking_workers,
+        )
+        # Consumed in the calling process, so nodes are built one batch at a time
+        self._transform_file_into_document_batches = functools.partial(
+            IngestionHelper.transform_file_into_document_batches,
+            chunking_workers=chunking_workers,
+        )
 
     @abc.abstractmethod
     def ingest(self, file_name: str, file_data: Path) -> list[Document]:
@@ -97,6 +109,13 @@ class BaseIngestComponentWithIndex(BaseIngestComponent, abc.ABC):
     def _save_index(self) -> None:
         self._index.storage_context.persist(persist_dir=local_data_path)
 
+    def _persist_index(self) -> None:
+        with self._index_thread_lock:
+            logger.debug("Persisting the index and nodes")
+            # persist the index and nodes
+            self._save_index()
+            logger.debug("Persisted the index and nodes")
+
     def delete(self, doc_id: str) -> None:
         with self._index_thread_lock:
             # Delete the document from the index
@@ -119,31 +138,33 @@ class SimpleIngestComponent(BaseIngestComponentWithIndex):
 
     def ingest(self, file_name: str, file_data: Path) -> list[Document]:
         logger.info("Ingesting file_name=%s", file_name)
-        documents = IngestionHelper.transform_file_into_documents(file_name, file_data)
+        documents = self._ingest_file(file_name, file_data)
         logger.info(
             "Transformed file=%s into count=%s documents", file_name, len(documents)
         )
-        logger.debug("Saving the documents in the index and doc store")
-        return self._save_docs(documents)
+        return documents
+
+    def _ingest_file(self, file_name: str, file_data: Path) -> list[Document]:
+        # Batches are inserted as they are parsed, but the whole storage context
+        # is persisted only once per file
+        documents: list[Document] = []
+        for batch in self._transform_file_into_document_batches(file_name, file_data):
+            logger.debug("Saving count=%s documents in the index", len(batch))
+            documents.extend(self._insert_docs(batch))
+        self._persist_index()
+        return documents
 
     def bulk_ingest(self, files: list[tuple[str, Path]]) -> list[Document]:
         saved_documents = []
         for file_name, file_data in files:
-            documents = IngestionHelper.transform_file_into_documents(
-                file_name, file_data
-            )
-            saved_documents.extend(self._save_docs(documents))
+            saved_documents.extend(self._ingest_file(file_name, file_data))
         return saved_documents
 
-    def _save_docs(self, documents: list[Document]) -> list[Document]:
+    def _insert_docs(self, documents: list[Document]) -> list[Document]:
         logger.debug("Transforming count=%s documents into nodes", len(documents))
         with self._index_thread_lock:
             for document in documents:
                 self._index.insert(document, show_progress=True)
-            logger.debug("Persisting the index and nodes")
-            # persist the index and nodes
-            self._save_index()
-            logger.debug("Persisted the index and nodes")
         return documents
 
 
@@ -177,18 +198,27 @@ class BatchIngestComponent(BaseIngestComponentWithIndex):
 
     def ingest(self, file_name: str, file_data: Path) -> list[Document]:
         logger.info("Ingesting file_name=%s", file_name)
-        documents = IngestionHelper.transform_file_into_documents(file_name, file_data)
+        documents = self._ingest_file(file_name, file_data)
         logger.info(
             "Transformed file=%s into count=%s documents", file_name, len(documents)
         )
-        logger.debug("Saving the documents in the index and doc store")
-        return self._save_docs(documents)
+        return documents
+
+    def _ingest_file(self, file_name: str, file_data: Path) -> list[Document]:
+        # Batches are inserted as they are parsed, but the whole storage context
+        # is persisted only once per file
+        documents: list[Document] = []
+        for batch in self._transform_file_into_document_batches(file_name, file_data):
+            logger.debug("Saving count=%s documents in the index", len(batch))
+            documents.extend(self._insert_docs(batch))
+        self._persist_index()
+        return documents
 
     def bulk_ingest(self, files: list[tuple[str, Path]]) -> list[Document]:
         documents = list(
             itertools.chain.from_iterable(
                 self._file_to_documents_work_pool.starmap(
-                    IngestionHelper.transform_file_into_documents, files
+                    self._transform_file_into_documents, files
                 )
             )
         )
@@ -200,6 +230,11 @@ class BatchIngestComponent(BaseIngestComponentWithIndex):
         return self._save_docs(documents)
 
     def _save_docs(self, documents: list[Document]) -> list[Document]:
+        self._insert_docs(documents)
+        self._persist_index()
+        return documents
+
+    def _insert_docs(self, documents: list[Document]) -> list[Document]:
         logger.debug("Transforming count=%s documents into nodes", len(documents))
         nodes = run_transformations(
             documents,  # type: ignore[arg-type]
@@ -214,10 +249,6 @@ class BatchIngestComponent(BaseIngestComponentWithIndex):
                 self._index.docstore.set_document_hash(
                     document.get_doc_id(), document.hash
                 )
-            logger.debug("Persisting the index and nodes")
-            # persist the index and nodes
-            self._save_index()
-            logger.debug("Persisted the index and nodes")
         return documents
 
 
@@ -262,7 +293,7 @@ class ParallelizedIngestComponent(BaseIngestComponentWithIndex):
         # Running in a single (1) process to release the current
         # thread, and take a dedicated CPU core for computation
         documents = self._file_to_documents_work_pool.apply(
-            IngestionHelper.transform_file_into_documents, (file_name, file_data)
+            self._transform_file_into_documents, (file_name, file_data)
         )
         logger.info(
             "Transformed file=%s into count=%s documents", file_name, len(documents)
@@ -446,7 +477,9 @@ class PipelineIngestComponent(BaseIngestComponentWithIndex):
                 elif cmd == "process":
                     node_stack.extend(nodes)  # type: ignore[arg-type]
                     doc_stack.extend(documents)  # type: ignore[arg-type]
-                    file_stack.append(file_name)  # type: ignore[arg-type]
+                    # A large file arrives in several batches, list it once
+                    if not file_stack or file_stack[-1] != file_name:
+                        file_stack.append(file_name)  # type: ignore[arg-type]
                     # Constant saving is heavy on I/O - accumulate to a threshold
                     if len(node_stack) >= self.NODE_FLUSH_COUNT:
                         self._save_docs(file_stack, doc_stack, node_stack)
@@ -459,21 +492,26 @@ class PipelineIngestComponent(BaseIngestComponentWithIndex):
         self.node_q.put(("flush", None, None, None))
         self.node_q.join()
 
+    def _enqueue_file(self, file_name: str, file_data: Path) -> list[Document]:
+        # The shallow doc_q applies back-pressure between batches of a large file
+        docs: list[Document] = []
+        for documents in self._transform_file_into_document_batches(
+            file_name, file_data
+        ):
+            self.doc_q.put(("process", file_name, documents))
+            docs.extend(documents)
+        return docs
+
     def ingest(self, file_name: str, file_data: Path) -> list[Document]:
-        documents = IngestionHelper.transform_file_into_documents(file_name, file_data)
-        self.doc_q.put(("process", file_name, documents))
+        docs = self._enqueue_file(file_name, file_data)
         self._flush()
-        return documents
+        return docs
 
     def bulk_ingest(self, files: list[tuple[str, Path]]) -> list[Document]:
         docs = []
         for file_name, file_data in eta(files):
             try:
-                documents = IngestionHelper.transform_file_into_documents(
-                    file_name, file_data
-                )
-                self.doc_q.put(("process", file_name, documents))
-                docs.extend(documents)
+                docs.extend(self._enqueue_file(file_name, file_data))
             except Exception:
                 logger.exception(f"Skipping {file_data.name}")
         self._flush()
@@ -494,6 +532,7 @@ def get_ingestion_component(
             embed_model=embed_model,
             transformations=transformations,
             count_workers=settings.embedding.count_workers,
+            chunking_workers=settings.embedding.chunking_workers,
         )
     elif ingest_mode == "parallel":
         return ParallelizedIngestComponent(
@@ -501,6 +540,7 @@ def get_ingestion_component(
             embed_model=embed_model,
             transformations=transformations,
             count_workers=settings.embedding.count_workers,
+            chunking_workers=settings.embedding.chunking_workers,
         )
     elif ingest_mode == "pipeline":
         return PipelineIngestComponent(
@@ -508,10 +548,12 @@ def get_ingestion_component(
             embed_model=embed_model,
             transformations=transformations,
             count_workers=settings.embedding.count_workers,
+            chunking_workers=settings.embedding.chunking_workers,
         )
     else:
         return SimpleIngestComponent(
             storage_context=storage_context,
             embed_model=embed_model,
             transformations=transformations,
+            chunking_workers=settings.embedding.chunking_workers,
         )
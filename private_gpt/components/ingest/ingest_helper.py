@@ -1,6 +1,9 @@
 import logging
-import re
-from copy import deepcopy
+import multiprocessing
+import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -15,7 +18,16 @@ except ImportError:  # pragma: no cover - dependency is optional at runtime
     DoclingReader = None
 
 
-_HEADING_PATTERN = re.compile(r"^(?P<heading>#{1,6}\s+.+)$", re.MULTILINE)
+_MAX_HEADING_LEVEL = 6
+# Metadata hidden from the embeddings and from the LLM context. Pydantic copies
+# them on assignment, so documents never share (and SentenceWindowNodeParser
+# never extends) these module-level lists.
+_EXCLUDED_EMBED_METADATA_KEYS = ["doc_id"]
+_EXCLUDED_LLM_METADATA_KEYS = ["file_name", "doc_id", "page_label"]
+# Maximum number of documents handed at once to the index by the ingest components
+DOCUMENT_BATCH_SIZE = 256
+# Minimum number of source documents sent to a chunking worker at once
+_MIN_CHUNKING_BATCH = 4
 
 
 class IngestionHelper:
@@ -25,18 +37,50 @@ class IngestionHelper:
     These methods are thread-safe (and multiprocessing-safe).
     """
 
+    # One DoclingReader per process, built on first use and shared by its threads
+    _reader: Any = None
+    _reader_pid: int | None = None
+    _reader_lock = threading.Lock()
+
     @staticmethod
     def transform_file_into_documents(
-        file_name: str, file_data: Path
+        file_name: str, file_data: Path, chunking_workers: int = 1
     ) -> list[Document]:
-        documents = IngestionHelper._load_file_to_documents(file_name, file_data)
-        for document in documents:
+        # Whole file at once, for the work pools that have to pickle their result
+        return [
+            document
+            for batch in IngestionHelper.transform_file_into_document_batches(
+                file_name, file_data, chunking_workers=chunking_workers
+            )
+            for document in batch
+        ]
+
+    @staticmethod
+    def transform_file_into_document_batches(
+        file_name: str,
+        file_data: Path,
+        batch_size: int = DOCUMENT_BATCH_SIZE,
+        chunking_workers: int = 1,
+    ) -> Iterator[list[Document]]:
+        """Yield the documents of a file in batches of at most ``batch_size``."""
+        batch: list[Document] = []
+        for document in IngestionHelper._load_file_to_documents(
+            file_name, file_data, chunking_workers
+        ):
             document.metadata["file_name"] = file_name
-        IngestionHelper._exclude_metadata(documents)
-        return documents
+            batch.append(document)
+            if len(batch) >= batch_size:
+                IngestionHelper._exclude_metadata(batch)
+                yield batch
+                batch = []
+        if batch:
+            IngestionHelper._exclude_metadata(batch)
+            yield batch
 
     @staticmethod
-    def _load_file_to_documents(file_name: str, file_data: Path) -> list[Document]:
+    def _load_file_to_documents(
+        file_name: str, file_data: Path, chunking_workers: int = 1
+    ) -> Iterator[Document]:
         logger.debug("Transforming file_name=%s into documents", file_name)
         if DoclingReader is None:
             raise ImportError(
@@ -44,78 +88,137 @@ class IngestionHelper:
                 "`llama-index-readers-docling` extra to enable document ingestion."
             )
 
-        reader = DoclingReader()
-        docling_documents = reader.load_data(file_data)
+        docling_documents = IngestionHelper._get_reader().load_data(file_data)
 
-        documents: list[Document] = []
-        for source_document in docling_documents:
-            documents.extend(
-                IngestionHelper._chunk_document_by_markdown_heading(source_document)
-            )
+        yield from IngestionHelper._chunk_documents(docling_documents, chunking_workers)
 
-        for document in documents:
-            document.text = document.text.replace("\u0000", "")
+    @classmethod
+    def _get_reader(cls) -> Any:
+        pid = os.getpid()
+        if cls._reader is not None and cls._reader_pid == pid:
+            return cls._reader
+        with cls._reader_lock:
+            # Forked workers inherit the parent's reader, rebuild it per process
+            if cls._reader is None or cls._reader_pid != pid:
+                cls._reader = DoclingReader()
+                cls._reader_pid = pid
+            return cls._reader
+
+    @staticmethod
+    def _chunk_documents(
+        source_documents: list[Document], chunking_workers: int
+    ) -> Iterator[Document]:
+        workers = min(chunking_workers, len(source_documents))
+        # Workers of the batch/parallel ingest pools are daemonic and cannot fork
+        if workers <= 1 or multiprocessing.current_process().daemon:
+            for source_document in source_documents:
+                yield from IngestionHelper._chunk_document_by_markdown_heading(
+                    source_document
+                )
+            return
+
+        logger.debug(
+            "Chunking count=%s documents with workers=%s",
+            len(source_documents),
+            workers,
+        )
+        chunksize = max(_MIN_CHUNKING_BATCH, len(source_documents) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunks in executor.map(
+                IngestionHelper._chunk_document_by_markdown_heading,
+                source_documents,
+                chunksize=chunksize,
+            ):
+                yield from chunks
 
-        return documents
+    @staticmethod
+    def _find_markdown_headings(text: str) -> list[tuple[int, int, str]]:
+        """Return ``(offset, level, title)`` for every ATX heading line in ``text``.
+
+        A heading line starts with one to six ``#`` followed by a space or a tab.
+        Lines are scanned with a cheap first-character test instead of a regex.
+        """
+        headings: list[tuple[int, int, str]] = []
+        offset = 0
+        length = len(text)
+        while offset < length:
+            line_end = text.find("\n", offset)
+            if line_end == -1:
+                line_end = length
+            if text[offset] == "#":
+                line = text[offset:line_end]
+                level = len(line) - len(line.lstrip("#"))
+                title = line[level:]
+                if level <= _MAX_HEADING_LEVEL and title[:1] in (" ", "\t"):
+                    title = title.strip()
+                    if title:
+                        headings.append((offset, level, title))
+            offset = line_end + 1
+        return headings
 
     @staticmethod
-    def _chunk_document_by_markdown_heading(source_document: Document) -> list[Document]:
-        text = source_document.text or ""
+    def _chunk_document_by_markdown_heading(
+        source_document: Document,
+    ) -> list[Document]:
+        # Strip NULs once on the source, every chunk is sliced from the clean text
+        text = (source_document.text or "").replace("\u0000", "")
         chunks: list[Document] = []
 
-        heading_matches = list(_HEADING_PATTERN.finditer(text))
-        if not heading_matches:
-            cloned_document = Document(text=text, doc_id=source_document.doc_id)
-            cloned_document.metadata = IngestionHelper._clone_metadata(source_document)
-            chunks.append(cloned_document)
+        # Chunks only rebind top-level keys (chapter_title, chapter_level, doc_id,
+        # file_name), so a shallow copy of the source metadata is enough. Passing it
+        # to the constructor avoids a second validation on assignment.
+        metadata = getattr(source_document, "metadata", {}) or {}
+
+        headings = IngestionHelper._find_markdown_headings(text)
+        if not headings:
+            chunks.append(
+                Document(
+                    text=text, doc_id=source_document.doc_id, extra_info={**metadata}
+                )
+            )
             return chunks
 
         # Capture text that appears before the first heading as its own chunk
-        first_heading_start = heading_matches[0].start()
+        first_heading_start = headings[0][0]
         prefix = text[:first_heading_start].strip()
         if prefix:
-            chunk_doc = Document(
-                text=prefix,
-                doc_id=f"{source_document.doc_id}_preamble",
-            )
-            chunk_doc.metadata = IngestionHelper._clone_metadata(source_document)
-            chunk_doc.metadata["chapter_title"] = "Preamble"
-            chunk_doc.metadata["chapter_level"] = 0
-            chunks.append(chunk_doc)
-
-        for idx, match in enumerate(heading_matches):
-            start = match.start()
-            end = (
-                heading_matches[idx + 1].start()
-                if idx + 1 < len(heading_matches)
-                else len(text)
+            chunks.append(
+                Document(
+                    text=prefix,
+                    doc_id=f"{source_document.doc_id}_preamble",
+                    extra_info={
+                        **metadata,
+                        "chapter_title": "Preamble",
+                        "chapter_level": 0,
+                    },
+                )
             )
+
+        for idx, (start, level, title) in enumerate(headings):
+            end = headings[idx + 1][0] if idx + 1 < len(headings) else len(text)
             chunk_text = text[start:end].strip()
             if not chunk_text:
                 continue
-            heading_line = match.group("heading")
-            chunk_doc = Document(
-                text=chunk_text,
-                doc_id=f"{source_document.doc_id}_chapter_{idx}",
+            chunks.append(
+                Document(
+                    text=chunk_text,
+                    doc_id=f"{source_document.doc_id}_chapter_{idx}",
+                    extra_info={
+                        **metadata,
+                        "chapter_title": title,
+                        "chapter_level": level,
+                    },
+                )
             )
-            chunk_doc.metadata = IngestionHelper._clone_metadata(source_document)
-            chunk_doc.metadata["chapter_title"] = heading_line.lstrip("#").strip()
-            chunk_doc.metadata["chapter_level"] = heading_line.count("#")
-            chunks.append(chunk_doc)
 
         return chunks
 
     @staticmethod
-    def _clone_metadata(document: Document) -> dict[str, Any]:
-        metadata = getattr(document, "metadata", {}) or {}
-        return deepcopy(metadata)
-
-    @staticmethod
-def _exclude_metadata(documents: list[Document]) -> None:
+    def _exclude_metadata(documents: list[Document]) -> None:
         logger.debug("Excluding metadata from count=%s documents", len(documents))
         for document in documents:
             document.metadata["doc_id"] = document.doc_id
             # We don't want the Embeddings search to receive this metadata
-            document.excluded_embed_metadata_keys = ["doc_id"]
+            document.excluded_embed_metadata_keys = _EXCLUDED_EMBED_METADATA_KEYS
             # We don't want the LLM to receive these metadata in the context
-            document.excluded_llm_metadata_keys = ["file_name", "doc_id", "page_label"]
+            document.excluded_llm_metadata_keys = _EXCLUDED_LLM_METADATA_KEYS
@@ -1,24 +1,141 @@
 """SQLite-backed node store implementations."""
+
 from __future__ import annotations
 
 import json
 import sqlite3
+import threading
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, ClassVar, Self
 
 from llama_index.core.storage.docstore import SimpleDocumentStore
 from llama_index.core.storage.index_store import SimpleIndexStore
+from llama_index.core.storage.kvstore.simple_kvstore import SimpleKVStore
+from llama_index.core.storage.kvstore.types import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_COLLECTION,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+try:
+    import orjson
+
+    def _dumps(value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # orjson rejects lone surrogates (e.g. surrogateescape-decoded file
+            # names) and integers wider than 64 bits, which json writes as-is
+            return json.dumps(value).encode()
+
+    def _loads(payload: bytes | str) -> Any:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # Payloads written by the json fallback, e.g. with "\ud800" escapes
+            return json.loads(payload)
+
+except ImportError:  # pragma: no cover - orjson is installed with fastapi[all]
+
+    def _dumps(value: Any) -> bytes:
+        # Compact, but ASCII-escaped so lone surrogates still encode
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def _loads(payload: bytes | str) -> Any:
+        return json.loads(payload)
+
 
 DOCSTORE_DB = "docstore.sqlite"
 INDEXSTORE_DB = "indexstore.sqlite"
 
 
+# A row is identified by the kvstore collection it belongs to and its key
+RowId = tuple[str, str]
+
+
+class _TrackingKVStore(SimpleKVStore):
+    """SimpleKVStore that remembers which keys changed since the last persist.
+
+    Every docstore/index store mutation goes through ``put``/``delete``, so tracking
+    them here covers ``add_documents``, ``delete_document``, ``set_document_hash``,
+    ``delete_ref_doc`` and their async variants alike.
+    """
+
+    def __init__(
+        self, data: dict[str, dict[str, dict[str, Any]]] | None = None
+    ) -> None:
+        super().__init__(data)
+        self._dirty_ids: set[RowId] = set()
+        self._deleted_ids: set[RowId] = set()
+
+    def put(
+        self, key: str, val: dict[str, Any], collection: str = DEFAULT_COLLECTION
+    ) -> None:
+        super().put(key, val, collection)
+        self._deleted_ids.discard((collection, key))
+        self._dirty_ids.add((collection, key))
+
+    def delete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        deleted = super().delete(key, collection)
+        if deleted:
+            self._dirty_ids.discard((collection, key))
+            self._deleted_ids.add((collection, key))
+        return deleted
+
+    def mark_all_dirty(self) -> None:
+        self._dirty_ids.update(
+            (collection, key)
+            for collection, values in self._data.items()
+            for key in values
+        )
+
+    def pop_changes(self) -> tuple[set[RowId], set[RowId]]:
+        dirty, deleted = self._dirty_ids, self._deleted_ids
+        self._dirty_ids, self._deleted_ids = set(), set()
+        return dirty, deleted
+
+    def restore_changes(self, dirty: set[RowId], deleted: set[RowId]) -> None:
+        # Keys touched again since ``pop_changes`` already reflect the latest state
+        touched = self._dirty_ids | self._deleted_ids
+        self._dirty_ids.update(dirty - touched)
+        self._deleted_ids.update(deleted - touched)
+
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA locking_mode=NORMAL",
+)
+# Let SQLite refresh stale planner statistics after this many written or deleted
+# rows. PRAGMA optimize only re-analyzes when needed, unlike ANALYZE, which scans
+# the whole store. Every lookup goes through a PRIMARY KEY, so no secondary index.
+_OPTIMIZE_EVERY_ROWS = 1000
+
+
+def _open_connection(db_path: Path) -> sqlite3.Connection:
+    """Open ``db_path`` in autocommit mode with the write-friendly PRAGMAs applied.
+
+    Transactions are managed explicitly with BEGIN/COMMIT by the callers. The
+    connection is shared by the ingestion threads, which serialize on the store lock.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    for pragma in _PRAGMAS:
+        connection.execute(pragma)
+    return connection
+
+
 def _ensure_docstore_schema(connection: sqlite3.Connection) -> None:
     connection.execute(
         """
         CREATE TABLE IF NOT EXISTS documents (
             doc_id TEXT PRIMARY KEY,
-            payload TEXT NOT NULL
+            payload BLOB NOT NULL
         )
         """
     )
@@ -26,7 +143,7 @@ def _ensure_docstore_schema(connection: sqlite3.Connection) -> None:
         """
         CREATE TABLE IF NOT EXISTS ref_doc_info (
             doc_id TEXT PRIMARY KEY,
-            payload TEXT NOT NULL
+            payload BLOB NOT NULL
         )
         """
     )
@@ -34,166 +151,281 @@ def _ensure_docstore_schema(connection: sqlite3.Connection) -> None:
         """
         CREATE TABLE IF NOT EXISTS metadata (
             key TEXT PRIMARY KEY,
-            payload TEXT NOT NULL
+            payload BLOB NOT NULL
         )
         """
     )
 
 
-def _write_docstore(db_path: Path, data: dict[str, Any]) -> None:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    connection = sqlite3.connect(db_path)
-    try:
-        _ensure_docstore_schema(connection)
-        docs = data.get("documents", {})
-        connection.execute("DELETE FROM documents")
-        if docs:
-            connection.executemany(
-                "INSERT OR REPLACE INTO documents (doc_id, payload) VALUES (?, ?)",
-                ((doc_id, json.dumps(payload)) for doc_id, payload in docs.items()),
-            )
+def _ensure_indexstore_schema(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS index_metadata (
+            key TEXT PRIMARY KEY,
+            payload BLOB NOT NULL
+        )
+        """
+    )
 
-        ref_docs = data.get("ref_doc_info", {})
-        connection.execute("DELETE FROM ref_doc_info")
-        if ref_docs:
-            connection.executemany(
-                "INSERT OR REPLACE INTO ref_doc_info (doc_id, payload) VALUES (?, ?)",
-                ((doc_id, json.dumps(payload)) for doc_id, payload in ref_docs.items()),
-            )
 
-        extra = {k: v for k, v in data.items() if k not in {"documents", "ref_doc_info"}}
-        connection.execute("DELETE FROM metadata")
-        if extra:
-            connection.executemany(
-                "INSERT OR REPLACE INTO metadata (key, payload) VALUES (?, ?)",
-                ((key, json.dumps(value)) for key, value in extra.items()),
-            )
-        connection.commit()
-    finally:
-        connection.close()
+def _group_by_collection(row_ids: set[RowId]) -> dict[str, list[str]]:
+    grouped: dict[str, list[str]] = {}
+    for collection, key in row_ids:
+        grouped.setdefault(collection, []).append(key)
+    return grouped
 
 
-def _read_docstore(db_path: Path) -> dict[str, Any]:
-    if not db_path.exists():
-        raise FileNotFoundError(db_path)
-    connection = sqlite3.connect(db_path)
-    try:
-        _ensure_docstore_schema(connection)
-        data: dict[str, Any] = {"documents": {}, "ref_doc_info": {}}
-        for doc_id, payload in connection.execute("SELECT doc_id, payload FROM documents"):
-            data["documents"][doc_id] = json.loads(payload)
-        for doc_id, payload in connection.execute(
-            "SELECT doc_id, payload FROM ref_doc_info"
-        ):
-            data["ref_doc_info"][doc_id] = json.loads(payload)
-        for key, payload in connection.execute("SELECT key, payload FROM metadata"):
-            data[key] = json.loads(payload)
-        return data
-    finally:
-        connection.close()
-
-
-def _write_indexstore(db_path: Path, data: dict[str, Any]) -> None:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    connection = sqlite3.connect(db_path)
+def _write_changes(
+    connection: sqlite3.Connection,
+    ensure_schema: Callable[[sqlite3.Connection], None],
+    tables: dict[str, tuple[str, str]],
+    data: dict[str, dict[str, Any]],
+    dirty: set[RowId],
+    deleted: set[RowId],
+    replace_all: bool = False,
+) -> None:
+    """Upsert the ``dirty`` rows and delete the ``deleted`` ones in one transaction.
+
+    ``tables`` maps each kvstore collection to its ``(table, key_column)``; rows of
+    collections without a table are ignored.
+    """
+    removed_keys = _group_by_collection(deleted)
+    changed_keys = _group_by_collection(dirty)
     try:
-        connection.execute(
-            """
-            CREATE TABLE IF NOT EXISTS index_metadata (
-                key TEXT PRIMARY KEY,
-                payload TEXT NOT NULL
-            )
-            """
-        )
-        connection.execute("DELETE FROM index_metadata")
-        if data:
-            connection.executemany(
-                "INSERT OR REPLACE INTO index_metadata (key, payload) VALUES (?, ?)",
-                ((key, json.dumps(value)) for key, value in data.items()),
-            )
-        connection.commit()
-    finally:
-        connection.close()
+        connection.execute("BEGIN IMMEDIATE")
+        ensure_schema(connection)
+        for collection, (table, key_column) in tables.items():
+            if replace_all:
+                connection.execute(f"DELETE FROM {table}")
+            removed = removed_keys.get(collection)
+            if removed:
+                connection.executemany(
+                    f"DELETE FROM {table} WHERE {key_column} = ?",
+                    ((key,) for key in removed),
+                )
+            changed = changed_keys.get(collection)
+            if changed:
+                values = data.get(collection, {})
+                # Binding one row per key beats a single json_each() insert, which
+                # makes SQLite parse and re-encode every payload again
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({key_column}, payload) VALUES (?, ?)",
+                    ((key, _dumps(values[key])) for key in changed if key in values),
+                )
+        connection.execute("COMMIT")
+    except BaseException:
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        raise
 
 
-def _read_indexstore(db_path: Path) -> dict[str, Any]:
-    if not db_path.exists():
-        raise FileNotFoundError(db_path)
-    connection = sqlite3.connect(db_path)
-    try:
-        connection.execute(
-            """
-            CREATE TABLE IF NOT EXISTS index_metadata (
-                key TEXT PRIMARY KEY,
-                payload TEXT NOT NULL
-            )
-            """
+def _read_rows(
+    connection: sqlite3.Connection, table: str, key_column: str
+) -> dict[str, Any]:
+    # Iterating the cursor streams the rows; fetchall() is no faster and would keep
+    # every raw payload alive next to its decoded value
+    return {
+        key: _loads(payload)
+        for key, payload in connection.execute(
+            f"SELECT {key_column}, payload FROM {table}"
         )
-        data: Dict[str, Any] = {}
-        for key, payload in connection.execute("SELECT key, payload FROM index_metadata"):
-            data[key] = json.loads(payload)
-        return data
-    finally:
-        connection.close()
+    }
 
 
-class SqliteDocumentStore(SimpleDocumentStore):
-    """SimpleDocumentStore that persists data in SQLite."""
+def _read_tables(
+    connection: sqlite3.Connection,
+    ensure_schema: Callable[[sqlite3.Connection], None],
+    tables: dict[str, tuple[str, str]],
+) -> tuple[dict[str, dict[str, Any]], bool]:
+    """Load every collection in ``tables``.
+
+    Earlier versions stored each collection as a single row of the key-value table,
+    keyed by the collection name. Those rows are unpacked here, and the returned
+    flag tells the caller that the file still uses that legacy layout.
+    """
+    ensure_schema(connection)
+    data = {
+        collection: _read_rows(connection, table, key_column)
+        for collection, (table, key_column) in tables.items()
+    }
+
+    legacy = False
+    for collection in tables:
+        for values in tuple(data.values()):
+            legacy_rows = values.pop(collection, None)
+            if isinstance(legacy_rows, dict):
+                data[collection].update(legacy_rows)
+                legacy = True
+    return data, legacy
+
+
+def _resolve_db_path(
+    persist_dir: str | Path | None,
+    persist_path: str | Path | None,
+    db_name: str,
+) -> Path:
+    # StorageContext.persist passes the JSON file path of the simple stores
+    if persist_dir is None:
+        if persist_path is None:
+            raise ValueError("Either persist_dir or persist_path is required")
+        persist_dir = Path(persist_path).parent
+    return Path(persist_dir) / db_name
+
+
+class _SqliteStoreMixin(ABC):
+    """Persistence shared by the SQLite document and index stores.
 
-    def __init__(self) -> None:
-        super().__init__()
+    The connection is opened lazily and reused by every persist. Only the rows that
+    changed since the previous persist are written.
+    """
+
+    DEFAULT_DB_NAME: ClassVar[str]
+    _kvstore: Any
+
+    @staticmethod
+    @abstractmethod
+    def _ensure_schema(connection: sqlite3.Connection) -> None:
+        """Create the store's tables if they do not exist yet."""
+
+    @property
+    @abstractmethod
+    def _tables(self) -> dict[str, tuple[str, str]]:
+        """Map each kvstore collection to its ``(table, key_column)``."""
+
+    def _init_connection(self) -> None:
         self._db_path: Path | None = None
+        self._connection: sqlite3.Connection | None = None
+        self._connection_lock = threading.Lock()
+        # Whether the database at ``_db_path`` matches the last persisted state
+        self._synced = False
+        self._rows_since_optimize = 0
+
+    def _connect(self, db_path: Path) -> sqlite3.Connection:
+        if self._db_path != db_path:
+            self._close_connection()
+            self._db_path = db_path
+            self._synced = False
+        if self._connection is None:
+            self._connection = _open_connection(db_path)
+        return self._connection
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
 
     @classmethod
     def from_persist_dir(
         cls,
         persist_dir: str | Path,
         db_name: str | None = None,
-    ) -> "SqliteDocumentStore":
-        db_path = Path(persist_dir) / (db_name or DOCSTORE_DB)
-        data = _read_docstore(db_path)
-        base_store = SimpleDocumentStore.from_dict(data)
+    ) -> Self:
+        db_path = Path(persist_dir) / (db_name or cls.DEFAULT_DB_NAME)
+        if not db_path.exists():
+            raise FileNotFoundError(db_path)
         instance = cls()
-        instance.__dict__.update(base_store.__dict__)
-        instance._db_path = db_path
+        with instance._connection_lock:
+            connection = instance._connect(db_path)
+            data, legacy = _read_tables(
+                connection, instance._ensure_schema, instance._tables
+            )
+            instance._kvstore = _TrackingKVStore(data)
+            # Legacy files are rewritten row by row on the next persist
+            instance._synced = not legacy
         return instance
 
     def persist(
         self,
-        persist_dir: str | Path,
+        persist_dir: str | Path | None = None,
         db_name: str | None = None,
+        *,
+        persist_path: str | Path | None = None,
+        fs: Any = None,
     ) -> None:
-        db_path = Path(persist_dir) / (db_name or DOCSTORE_DB)
-        _write_docstore(db_path, self.to_dict())
-        self._db_path = db_path
+        db_path = _resolve_db_path(
+            persist_dir, persist_path, db_name or self.DEFAULT_DB_NAME
+        )
+        kvstore = self._kvstore
+        assert isinstance(kvstore, _TrackingKVStore)
+        with self._connection_lock:
+            connection = self._connect(db_path)
+            replace_all = not self._synced
+            if replace_all:
+                kvstore.mark_all_dirty()
+            dirty, deleted = kvstore.pop_changes()
+            try:
+                _write_changes(
+                    connection,
+                    self._ensure_schema,
+                    self._tables,
+                    kvstore.to_dict(),
+                    dirty,
+                    deleted,
+                    replace_all=replace_all,
+                )
+            except BaseException:
+                kvstore.restore_changes(dirty, deleted)
+                raise
+            self._synced = True
+            self._rows_since_optimize += len(dirty) + len(deleted)
+            if self._rows_since_optimize >= _OPTIMIZE_EVERY_ROWS:
+                connection.execute("PRAGMA optimize")
+                self._rows_since_optimize = 0
 
+    def close(self) -> None:
+        """Close the cached connection; a later persist reopens it."""
+        with self._connection_lock:
+            self._close_connection()
 
-class SqliteIndexStore(SimpleIndexStore):
-    """SimpleIndexStore that persists data in SQLite."""
+    async def aclose(self) -> None:
+        self.close()
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._db_path: Path | None = None
+    def __del__(self) -> None:
+        # Every write commits its own transaction, so there is nothing to flush.
+        # The attribute may be missing if __init__ failed.
+        connection = getattr(self, "_connection", None)
+        if connection is not None:
+            connection.close()
 
-    @classmethod
-    def from_persist_dir(
-        cls,
-        persist_dir: str | Path,
-        db_name: str | None = None,
-    ) -> "SqliteIndexStore":
-        db_path = Path(persist_dir) / (db_name or INDEXSTORE_DB)
-        data = _read_indexstore(db_path)
-        base_store = SimpleIndexStore.from_dict(data)
-        instance = cls()
-        instance.__dict__.update(base_store.__dict__)
-        instance._db_path = db_path
-        return instance
 
-    def persist(
+class SqliteDocumentStore(_SqliteStoreMixin, SimpleDocumentStore):
+    """SimpleDocumentStore that persists data in SQLite."""
+
+    DEFAULT_DB_NAME = DOCSTORE_DB
+    _ensure_schema = staticmethod(_ensure_docstore_schema)
+
+    def __init__(
         self,
-        persist_dir: str | Path,
-        db_name: str | None = None,
+        simple_kvstore: _TrackingKVStore | None = None,
+        namespace: str | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ) -> None:
-        db_path = Path(persist_dir) / (db_name or INDEXSTORE_DB)
-        _write_indexstore(db_path, self.to_dict())
-        self._db_path = db_path
+        super().__init__(
+            simple_kvstore or _TrackingKVStore(),
+            namespace=namespace,
+            batch_size=batch_size,
+        )
+        self._init_connection()
+
+    @property
+    def _tables(self) -> dict[str, tuple[str, str]]:
+        return {
+            self._node_collection: ("documents", "doc_id"),
+            self._ref_doc_collection: ("ref_doc_info", "doc_id"),
+            self._metadata_collection: ("metadata", "key"),
+        }
+
+
+class SqliteIndexStore(_SqliteStoreMixin, SimpleIndexStore):
+    """SimpleIndexStore that persists data in SQLite."""
+
+    DEFAULT_DB_NAME = INDEXSTORE_DB
+    _ensure_schema = staticmethod(_ensure_indexstore_schema)
+
+    def __init__(self, simple_kvstore: _TrackingKVStore | None = None) -> None:
+        super().__init__(simple_kvstore or _TrackingKVStore())
+        self._init_connection()
+
+    @property
+    def _tables(self) -> dict[str, tuple[str, str]]:
+        return {self._collection: ("index_metadata", "key")}
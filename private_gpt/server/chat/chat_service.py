@@ -53,13 +53,11 @@ class ChatEngineInput:
             if len(messages) > 0 and messages[-1].role == MessageRole.USER
             else None
         )
-        # Remove from messages list the system message and last message,
-        # if they exist. The rest is the chat history.
-        if system_message:
-            messages.pop(0)
-        if last_message:
-            messages.pop(-1)
-        chat_history = messages if len(messages) > 0 else None
+        # The chat history is what lies between the system message and the last
+        # message, if they exist. Sliced, so the caller's list is left untouched.
+        start = 1 if system_message else 0
+        end = len(messages) - (1 if last_message else 0)
+        chat_history = messages[start:end] or None
 
         return cls(
             system_message=system_message,
@@ -118,18 +116,19 @@ class ChatService:
         )
 
     def _decorate_response(self, text: str, sources: list[Chunk], use_context: bool) -> str:
-        if not use_context:
+        if not use_context or not sources:
             return text
         return self.citation_formatter.decorate(text, sources)
 
-    def _append_suffix_to_generator(self, generator: TokenGen, suffix: str) -> TokenGen:
-        def _generator() -> TokenGen:
-            for token in generator:
-                yield token
+    def _stream_with_citations(
+        self, response_gen: TokenGen, sources: list[Chunk]
+    ) -> TokenGen:
+        yield from response_gen
+        # Built once the model is done, so it never delays the first token
+        suffix = self.citation_formatter.build_suffix(sources)
+        if suffix:
             yield suffix
 
-        return _generator()
-
     def stream_chat(
         self,
         messages: list[ChatMessage],
@@ -162,14 +161,9 @@ class ChatService:
             chat_history=chat_history,
         )
         sources = [Chunk.from_node(node) for node in streaming_response.source_nodes]
-        suffix = (
-            self.citation_formatter.build_suffix(sources)
-            if use_context and sources
-            else ""
-        )
         response_gen = (
-            self._append_suffix_to_generator(streaming_response.response_gen, suffix)
-            if suffix
+            self._stream_with_citations(streaming_response.response_gen, sources)
+            if use_context and sources
             else streaming_response.response_gen
         )
         completion_gen = CompletionGen(
@@ -1,21 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Iterable
 
 from private_gpt.server.chunks.chunks_service import Chunk
 
 
-@dataclass(frozen=True)
-class CitationDetail:
-    """Description for a single inline citation."""
-
-    index: int
-    label: str
-    description: str
-    chunk: Chunk
-
-
 class InlineCitationFormatter:
     """Utility responsible for rendering inline citation markers.
 
@@ -27,50 +16,55 @@ class InlineCitationFormatter:
     def __init__(self, *, heading: str = "Sources") -> None:
         self.heading = heading
 
-    def _build_citation_details(self, sources: Iterable[Chunk]) -> list[CitationDetail]:
-        unique_chunks: list[Chunk] = []
-        seen_chunks: set[tuple[str, str]] = set()
+    @staticmethod
+    def _unique_sources(sources: Iterable[Chunk]) -> Iterable[Chunk]:
+        # Insertion-ordered, so the first occurrence of each chunk keeps its rank.
+        # A single setdefault does both the membership test and the insert.
+        unique_chunks: dict[tuple[str, str], Chunk] = {}
         for chunk in sources:
-            key = (chunk.document.doc_id, chunk.text)
-            if key in seen_chunks:
-                continue
-            seen_chunks.add(key)
-            unique_chunks.append(chunk)
-
-        details: list[CitationDetail] = []
-        for index, chunk in enumerate(unique_chunks, start=1):
-            metadata = chunk.document.doc_metadata or {}
-            file_name = metadata.get("file_name")
-            page_label = metadata.get("page_label")
-            doc_reference = file_name or chunk.document.doc_id
-            page_suffix = f" (page {page_label})" if page_label else ""
-            description = f"{doc_reference}{page_suffix}".strip()
-            details.append(
-                CitationDetail(
-                    index=index,
-                    label=f"[{index}]",
-                    description=description,
-                    chunk=chunk,
-                )
-            )
-
-        return details
+            unique_chunks.setdefault((chunk.document.doc_id, chunk.text), chunk)
+        return unique_chunks.values()
+
+    @staticmethod
+    def _describe(chunk: Chunk) -> str:
+        document = chunk.document
+        metadata = document.doc_metadata or {}
+        doc_reference = metadata.get("file_name") or document.doc_id
+        page_label = metadata.get("page_label")
+        if page_label:
+            return f"{doc_reference} (page {page_label})".strip()
+        return str(doc_reference).strip()
 
     def build_suffix(self, sources: Iterable[Chunk]) -> str:
         """Return a suffix that contains inline markers and a source section."""
 
-        details = self._build_citation_details(sources)
-        if not details:
+        # Empty containers are falsy, iterators always go through the loop below
+        if not sources:
+            return ""
+
+        inline_parts: list[str] = []
+        sources_parts: list[str] = []
+        for index, chunk in enumerate(self._unique_sources(sources), start=1):
+            label = f"[{index}]"
+            inline_parts.append(label)
+            sources_parts.append(f"{label} {self._describe(chunk)}")
+        if not inline_parts:
             return ""
 
-        inline_markers = " ".join(detail.label for detail in details)
-        sources_lines = [f"{detail.label} {detail.description}" for detail in details]
-        sources_block = f"{self.heading}\n" + "\n".join(sources_lines)
-        return f" {inline_markers}\n\n{sources_block}"
+        return (
+            " "
+            + " ".join(inline_parts)
+            + "\n\n"
+            + self.heading
+            + "\n"
+            + "\n".join(sources_parts)
+        )
 
     def decorate(self, text: str, sources: Iterable[Chunk]) -> str:
         """Decorate a completed answer with inline citations if available."""
 
+        if not sources:
+            return text
         suffix = self.build_suffix(sources)
         if not suffix:
             return text
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from llama_index.core.chat_engine import ContextChatEngine, SimpleChatEngine
 from llama_index.core.chat_engine.types import BaseChatEngine
@@ -18,6 +19,10 @@ from private_gpt.components.vector_store.vector_store_component import (
 from private_gpt.open_ai.extensions.context_filter import ContextFilter
 from private_gpt.settings.settings import Settings
 
+if TYPE_CHECKING:
+    from llama_index.core.postprocessor.types import BaseNodePostprocessor
+    from llama_index.core.schema import NodeWithScore, QueryBundle
+
 
 @dataclass
 class RagWorkflowInput:
@@ -28,6 +33,40 @@ class RagWorkflowInput:
     context_filter: ContextFilter | None
 
 
+class _WindowReplacementPostProcessor(MetadataReplacementPostProcessor):
+    """Replace node content with the target metadata, skipping nodes without it.
+
+    The upstream implementation renders the fallback content of every node, even
+    when the metadata key is present, and then writes it back unchanged.
+    """
+
+    def _postprocess_nodes(
+        self,
+        nodes: list[NodeWithScore],
+        query_bundle: QueryBundle | None = None,
+    ) -> list[NodeWithScore]:
+        key = self.target_metadata_key
+        for n in nodes:
+            replacement = n.node.metadata.get(key)
+            if replacement is not None:
+                n.node.set_content(replacement)
+        return nodes
+
+
+class _ScoreCutoffPostprocessor(SimilarityPostprocessor):
+    """Keep the nodes scoring at least ``similarity_cutoff`` in a single pass."""
+
+    def _postprocess_nodes(
+        self,
+        nodes: list[NodeWithScore],
+        query_bundle: QueryBundle | None = None,
+    ) -> list[NodeWithScore]:
+        cutoff = self.similarity_cutoff
+        if cutoff is None:
+            return list(nodes)
+        return [n for n in nodes if n.score is not None and n.score >= cutoff]
+
+
 class RagWorkflowFactory:
     """Factory that prepares the building blocks for a RAG workflow.
 
@@ -48,6 +87,24 @@ class RagWorkflowFactory:
         self._llm_component = llm_component
         self._vector_store_component = vector_store_component
         self._index = index
+        # Both postprocessors only hold their settings, so they are shared by engines
+        self._metadata_replacement = _WindowReplacementPostProcessor(
+            target_metadata_key="window"
+        )
+        self._similarity_postprocessor = (
+            _ScoreCutoffPostprocessor(similarity_cutoff=settings.rag.similarity_value)
+            if settings.rag.similarity_value
+            else None
+        )
+        # Loading the cross-encoder is the costly part of an engine, do it once
+        self._reranker = (
+            SentenceTransformerRerank(
+                model=settings.rag.rerank.model,
+                top_n=settings.rag.rerank.top_n,
+            )
+            if settings.rag.rerank.enabled
+            else None
+        )
 
     def build_chat_engine(self, workflow_input: RagWorkflowInput) -> BaseChatEngine:
         if not workflow_input.use_context:
@@ -61,23 +118,12 @@ class RagWorkflowFactory:
             context_filter=workflow_input.context_filter,
             similarity_top_k=self._settings.rag.similarity_top_k,
         )
-        node_postprocessors = [
-            MetadataReplacementPostProcessor(target_metadata_key="window"),
-        ]
-        if self._settings.rag.similarity_value:
-            node_postprocessors.append(
-                SimilarityPostprocessor(
-                    similarity_cutoff=self._settings.rag.similarity_value
-                )
-            )
+        node_postprocessors: list[BaseNodePostprocessor] = [self._metadata_replacement]
+        if self._similarity_postprocessor is not None:
+            node_postprocessors.append(self._similarity_postprocessor)
 
-        if self._settings.rag.rerank.enabled:
-            node_postprocessors.append(
-                SentenceTransformerRerank(
-                    model=self._settings.rag.rerank.model,
-                    top_n=self._settings.rag.rerank.top_n,
-                )
-            )
+        if self._reranker is not None:
+            node_postprocessors.append(self._reranker)
 
         return ContextChatEngine.from_defaults(
             system_prompt=workflow_input.system_prompt,
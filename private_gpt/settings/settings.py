@@ -232,6 +232,18 @@ class EmbeddingSettings(BaseModel):
             "Do not set it higher than your number of threads of your CPU."
         ),
     )
+    chunking_workers: int = Field(
+        1,
+        description=(
+            "The number of processes used to split the documents of a single file "
+            "by markdown heading.\n"
+            "Only files parsed into several documents benefit from it, and it is "
+            "ignored when the file is already parsed inside an ingest worker "
+            "process (bulk ingestion in `batch` mode, and every ingestion in "
+            "`parallel` mode).\n"
+            "Defaults to 1, which chunks in the calling process."
+        ),
+    )
     embed_dim: int = Field(
         384,
         description="The dimension of the embeddings stored in the Postgres database",
@@ -0,0 +1,46 @@
+from llama_index.core.llms import ChatMessage, MessageRole
+
+from private_gpt.server.chat.chat_service import ChatEngineInput, ChatService
+from private_gpt.server.chat.inline_citations import InlineCitationFormatter
+from private_gpt.server.chunks.chunks_service import Chunk
+from private_gpt.server.ingest.model import IngestedDoc
+
+
+def test_from_messages_splits_without_mutating() -> None:
+    messages = [
+        ChatMessage(role=MessageRole.SYSTEM, content="system"),
+        ChatMessage(role=MessageRole.USER, content="first"),
+        ChatMessage(role=MessageRole.ASSISTANT, content="reply"),
+        ChatMessage(role=MessageRole.USER, content="second"),
+    ]
+
+    chat_engine_input = ChatEngineInput.from_messages(messages)
+
+    assert chat_engine_input.system_message == messages[0]
+    assert chat_engine_input.last_message == messages[3]
+    assert chat_engine_input.chat_history == messages[1:3]
+    assert len(messages) == 4
+
+
+def test_from_messages_without_history() -> None:
+    chat_engine_input = ChatEngineInput.from_messages(
+        [ChatMessage(role=MessageRole.USER, content="only")]
+    )
+
+    assert chat_engine_input.system_message is None
+    assert chat_engine_input.chat_history is None
+
+
+def test_stream_with_citations_appends_suffix_after_tokens() -> None:
+    service = ChatService.__new__(ChatService)
+    service.citation_formatter = InlineCitationFormatter()
+    source = Chunk(
+        object="context.chunk",
+        score=1.0,
+        document=IngestedDoc(object="ingest.document", doc_id="doc", doc_metadata={}),
+        text="alpha",
+    )
+
+    tokens = list(service._stream_with_citations(iter(["The ", "answer."]), [source]))
+
+    assert tokens == ["The ", "answer.", " [1]\n\nSources\n[1] doc"]
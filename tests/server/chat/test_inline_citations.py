@@ -0,0 +1,32 @@
+from private_gpt.server.chat.inline_citations import InlineCitationFormatter
+from private_gpt.server.chunks.chunks_service import Chunk
+from private_gpt.server.ingest.model import IngestedDoc
+
+
+def _chunk(doc_id: str, text: str, **metadata: str) -> Chunk:
+    return Chunk(
+        object="context.chunk",
+        score=1.0,
+        document=IngestedDoc(
+            object="ingest.document", doc_id=doc_id, doc_metadata=metadata
+        ),
+        text=text,
+    )
+
+
+def test_decorate_deduplicates_sources() -> None:
+    sources = [
+        _chunk("doc-1", "alpha", file_name="report.pdf", page_label="2"),
+        _chunk("doc-1", "alpha", file_name="report.pdf", page_label="2"),
+        _chunk("doc-2", "beta"),
+    ]
+
+    decorated = InlineCitationFormatter().decorate("The answer. ", sources)
+
+    assert decorated == (
+        "The answer. [1] [2]\n\nSources\n[1] report.pdf (page 2)\n[2] doc-2"
+    )
+
+
+def test_decorate_without_sources_returns_text() -> None:
+    assert InlineCitationFormatter().decorate("The answer.", []) == "The answer."
@@ -0,0 +1,34 @@
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from private_gpt.server.chat.rag_workflow import (
+    _ScoreCutoffPostprocessor,
+    _WindowReplacementPostProcessor,
+)
+
+
+def test_window_replacement_keeps_nodes_without_window() -> None:
+    nodes = [
+        NodeWithScore(node=TextNode(text="a", metadata={"window": "wide a"})),
+        NodeWithScore(node=TextNode(text="b")),
+    ]
+
+    processed = _WindowReplacementPostProcessor(
+        target_metadata_key="window"
+    ).postprocess_nodes(nodes)
+
+    assert [n.node.get_content() for n in processed] == ["wide a", "b"]
+
+
+def test_score_cutoff_drops_low_and_missing_scores() -> None:
+    nodes = [
+        NodeWithScore(node=TextNode(text="high"), score=0.9),
+        NodeWithScore(node=TextNode(text="low"), score=0.1),
+        NodeWithScore(node=TextNode(text="cutoff"), score=0.5),
+        NodeWithScore(node=TextNode(text="none")),
+    ]
+
+    processed = _ScoreCutoffPostprocessor(similarity_cutoff=0.5).postprocess_nodes(
+        nodes
+    )
+
+    assert [n.node.get_content() for n in processed] == ["high", "cutoff"]
@@ -0,0 +1,117 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from llama_index.core.schema import Document
+
+from private_gpt.components.ingest.ingest_helper import IngestionHelper
+
+
+def test_find_markdown_headings() -> None:
+    text = "intro\n# Title\nbody\n####### too deep\n#nospace\n## C# tips\n"
+    assert IngestionHelper._find_markdown_headings(text) == [
+        (6, 1, "Title"),
+        (45, 2, "C# tips"),
+    ]
+
+
+def test_chunk_document_by_markdown_heading() -> None:
+    source = Document(
+        text="Preface text\n# First\nalpha\n## Second\nbeta", doc_id="doc"
+    )
+    source.metadata = {"page_label": "1"}
+
+    chunks = IngestionHelper._chunk_document_by_markdown_heading(source)
+
+    assert [chunk.doc_id for chunk in chunks] == [
+        "doc_preamble",
+        "doc_chapter_0",
+        "doc_chapter_1",
+    ]
+    assert [chunk.text for chunk in chunks] == [
+        "Preface text",
+        "# First\nalpha",
+        "## Second\nbeta",
+    ]
+    assert [chunk.metadata["chapter_title"] for chunk in chunks] == [
+        "Preamble",
+        "First",
+        "Second",
+    ]
+    assert [chunk.metadata["chapter_level"] for chunk in chunks] == [0, 1, 2]
+    assert all(chunk.metadata["page_label"] == "1" for chunk in chunks)
+
+
+def test_chunk_document_without_headings_keeps_doc_id() -> None:
+    source = Document(text="plain text", doc_id="doc")
+
+    chunks = IngestionHelper._chunk_document_by_markdown_heading(source)
+
+    assert len(chunks) == 1
+    assert chunks[0].doc_id == "doc"
+    assert chunks[0].text == "plain text"
+
+
+def test_chunk_document_strips_nul_characters() -> None:
+    source = Document(text="# Ti\u0000tle\nbo\u0000dy", doc_id="doc")
+
+    chunks = IngestionHelper._chunk_document_by_markdown_heading(source)
+
+    assert [chunk.text for chunk in chunks] == ["# Title\nbody"]
+    assert chunks[0].metadata["chapter_title"] == "Title"
+
+
+def test_chunk_documents_with_workers_matches_serial() -> None:
+    sources = [
+        Document(text=f"# Title {idx}\nbody {idx}", doc_id=f"doc-{idx}")
+        for idx in range(5)
+    ]
+
+    serial = list(IngestionHelper._chunk_documents(sources, chunking_workers=1))
+    parallel = list(IngestionHelper._chunk_documents(sources, chunking_workers=2))
+
+    assert [(chunk.doc_id, chunk.text) for chunk in parallel] == [
+        (chunk.doc_id, chunk.text) for chunk in serial
+    ]
+
+
+def test_exclude_metadata_gives_each_document_its_own_keys() -> None:
+    documents = [Document(text="a", doc_id="a"), Document(text="b", doc_id="b")]
+
+    IngestionHelper._exclude_metadata(documents)
+    documents[0].excluded_llm_metadata_keys.append("window")
+
+    assert documents[0].metadata["doc_id"] == "a"
+    assert documents[1].excluded_llm_metadata_keys == [
+        "file_name",
+        "doc_id",
+        "page_label",
+    ]
+
+
+def test_transform_file_into_document_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    def load_file_to_documents(*args: object) -> Iterator[Document]:
+        for idx in range(5):
+            yield Document(text=f"text {idx}", doc_id=f"doc-{idx}")
+
+    monkeypatch.setattr(
+        IngestionHelper, "_load_file_to_documents", load_file_to_documents
+    )
+
+    batches = list(
+        IngestionHelper.transform_file_into_document_batches(
+            "file.pdf", Path("file.pdf"), batch_size=2
+        )
+    )
+
+    assert [[doc.doc_id for doc in batch] for batch in batches] == [
+        ["doc-0", "doc-1"],
+        ["doc-2", "doc-3"],
+        ["doc-4"],
+    ]
+    assert all(
+        doc.metadata["file_name"] == "file.pdf"
+        and doc.excluded_embed_metadata_keys == ["doc_id"]
+        for batch in batches
+        for doc in batch
+    )
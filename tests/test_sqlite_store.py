@@ -0,0 +1,106 @@
+import json
+import sqlite3
+from pathlib import Path
+
+from llama_index.core.schema import Document
+
+from private_gpt.components.node_store.sqlite_store import (
+    DOCSTORE_DB,
+    SqliteDocumentStore,
+)
+
+
+def _count_rows(db_path: Path, table: str) -> int:
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_docstore_round_trip(tmp_path: Path) -> None:
+    doc_store = SqliteDocumentStore()
+    doc_store.add_documents([Document(text="first", doc_id="doc-1")])
+    doc_store.set_document_hash("doc-1", "hash-1")
+    doc_store.persist(persist_path=str(tmp_path / "docstore.json"))
+
+    assert _count_rows(tmp_path / DOCSTORE_DB, "documents") == 1
+    loaded = SqliteDocumentStore.from_persist_dir(tmp_path)
+    assert loaded.get_document("doc-1").text == "first"  # type: ignore[union-attr]
+    assert loaded.get_document_hash("doc-1") == "hash-1"
+
+
+def test_docstore_round_trips_values_orjson_rejects(tmp_path: Path) -> None:
+    file_name = b"r\xe9sum\xe9.pdf".decode("utf-8", "surrogateescape")
+    doc_store = SqliteDocumentStore()
+    doc_store.add_documents(
+        [
+            Document(
+                text="first",
+                doc_id="doc-1",
+                extra_info={"file_name": file_name, "size": 2**70},
+            )
+        ]
+    )
+    doc_store.persist(tmp_path)
+    doc_store.add_documents([Document(text="second", doc_id="doc-2")])
+    doc_store.persist(tmp_path)
+
+    loaded = SqliteDocumentStore.from_persist_dir(tmp_path)
+    assert sorted(loaded.docs) == ["doc-1", "doc-2"]
+    metadata = loaded.get_document("doc-1").metadata  # type: ignore[union-attr]
+    assert metadata == {"file_name": file_name, "size": 2**70}
+
+
+def test_docstore_persists_only_changes(tmp_path: Path) -> None:
+    doc_store = SqliteDocumentStore()
+    doc_store.add_documents(
+        [
+            Document(text="first", doc_id="doc-1"),
+            Document(text="second", doc_id="doc-2"),
+        ]
+    )
+    doc_store.persist(tmp_path)
+
+    loaded = SqliteDocumentStore.from_persist_dir(tmp_path)
+    loaded.delete_document("doc-1")
+    loaded.add_documents([Document(text="third", doc_id="doc-3")])
+    dirty_ids = loaded._kvstore._dirty_ids  # type: ignore[attr-defined]
+    assert {key for _collection, key in dirty_ids} == {"doc-3"}
+    loaded.persist(tmp_path)
+
+    reloaded = SqliteDocumentStore.from_persist_dir(tmp_path)
+    assert sorted(reloaded.docs) == ["doc-2", "doc-3"]
+
+
+def test_docstore_optimizes_after_many_writes(tmp_path: Path) -> None:
+    doc_store = SqliteDocumentStore()
+    doc_store.add_documents([Document(text="first", doc_id="doc-1")])
+    doc_store.persist(tmp_path)
+    assert doc_store._rows_since_optimize > 0
+
+    doc_store.add_documents(
+        [Document(text=str(idx), doc_id=f"doc-{idx}") for idx in range(1000)]
+    )
+    doc_store.persist(tmp_path)
+    assert doc_store._rows_since_optimize == 0
+
+
+def test_docstore_reads_legacy_layout(tmp_path: Path) -> None:
+    source = SqliteDocumentStore()
+    source.add_documents([Document(text="first", doc_id="doc-1")])
+    db_path = tmp_path / DOCSTORE_DB
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, payload TEXT)")
+    connection.executemany(
+        "INSERT INTO metadata (key, payload) VALUES (?, ?)",
+        ((key, json.dumps(value)) for key, value in source.to_dict().items()),
+    )
+    connection.commit()
+    connection.close()
+
+    loaded = SqliteDocumentStore.from_persist_dir(tmp_path)
+    assert sorted(loaded.docs) == ["doc-1"]
+    loaded.persist(tmp_path)
+    assert _count_rows(db_path, "documents") == 1
+    assert _count_rows(db_path, "metadata") == 1